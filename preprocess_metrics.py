@@ -1,84 +1,113 @@
-import json
 import re
+import sys
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional
 
+CAMPUS_MAPPING = {
+    'MTY': 'Monterrey',
+    'PUE': 'Puebla',
+    'GDL': 'Guadalajara',
+    'CDJ': 'Cd. Juárez',
+    'TOL': 'Toluca',
+    'CCM': 'Ciudad de México',
+    'CEM': 'Estado de México',
+    'QRO': 'Querétaro',
+    'CHI': 'Chihuahua',
+    'SIN': 'Sinaloa',
+    'AGS': 'Aguascalientes',
+    'COB': 'Cd. Obregón',
+    'LEO': 'León',
+    'LAG': 'Laguna',
+    'SON': 'Sonora',
+    'HGO': 'Hidalgo',
+    'SLP': 'San Luis Potosí',
+    'CVA': 'Cuernavaca',
+    'CSF': 'Santa Fe',
+    'SAL': 'Saltillo',
+}
+
+# "Campus Name (MTY)"
+_PAREN_RE = re.compile(r'\((\w+)\)')
+
+# Strategies 2 and 3 scan the region once with an alternation of every code/name.
+# The lookahead lets overlapping hits through, so CAMPUS_MAPPING order still picks the winner.
+_CAMPUS_ORDER = {code: i for i, code in enumerate(CAMPUS_MAPPING)}
+_CODE_RE = re.compile('(?=(' + '|'.join(CAMPUS_MAPPING) + '))')
+_NAME_TO_CODE = {name.lower(): code for code, name in CAMPUS_MAPPING.items()}
+_NAME_RE = re.compile('(?=(' + '|'.join(map(re.escape, _NAME_TO_CODE)) + '))')
+
+# Metric fields carried into current_month / previous_year_month, with their defaults
+METRIC_DEFAULTS = {
+    'POST_COMMENTS__SUM': 0,
+    'ALCANCE_TOTAL': 0.0,
+    'VOLUMEN_DE_PUBLICACIONES': 0,
+    'INTERACCIONES_TOTALES': 0,
+}
+
+@lru_cache(maxsize=64)
 def extract_campus_from_region(region: str) -> tuple[str, str]:
-    """Extract campus ID and name from REGION field - handles multiple formats"""
-    
-    CAMPUS_MAPPING = {
-        'MTY': 'Monterrey',
-        'PUE': 'Puebla',
-        'GDL': 'Guadalajara',
-        'CDJ': 'Cd. Juárez',
-        'TOL': 'Toluca',
-        'CCM': 'Ciudad de México',
-        'CEM': 'Estado de México',
-        'QRO': 'Querétaro',
-        'CHI': 'Chihuahua',
-        'SIN': 'Sinaloa',
-        'AGS': 'Aguascalientes',
-        'COB': 'Cd. Obregón',
-        'LEO': 'León',
-        'LAG': 'Laguna',
-        'SON': 'Sonora',
-        'HGO': 'Hidalgo',
-        'SLP': 'San Luis Potosí',
-        'CVA': 'Cuernavaca',
-        'CSF': 'Santa Fe',
-        'SAL': 'Saltillo',
-    }
+    """Extract campus ID and name from REGION field - handles multiple formats (cached per region)"""
     
     # Strategy 1: Try to extract from parentheses "Campus Name (MTY)"
-    match = re.search(r'\((\w+)\)', region)
+    match = _PAREN_RE.search(region)
     if match:
         campus_id = match.group(1).upper()
         campus_name = CAMPUS_MAPPING.get(campus_id, campus_id)
         return campus_id, campus_name
     
     # Strategy 2: Look for campus ID codes directly in the text
-    region_upper = region.upper()
-    for code in CAMPUS_MAPPING.keys():
-        if code in region_upper:
-            return code, CAMPUS_MAPPING[code]
+    codes = {m.group(1) for m in _CODE_RE.finditer(region.upper())}
+    if codes:
+        code = min(codes, key=_CAMPUS_ORDER.__getitem__)
+        return code, CAMPUS_MAPPING[code]
     
     # Strategy 3: Look for campus full names in the text
-    for code, name in CAMPUS_MAPPING.items():
-        if name.lower() in region.lower():
-            return code, name
+    codes = {_NAME_TO_CODE[m.group(1)] for m in _NAME_RE.finditer(region.lower())}
+    if codes:
+        code = min(codes, key=_CAMPUS_ORDER.__getitem__)
+        return code, CAMPUS_MAPPING[code]
     
     # Fallback: Use first 3 letters
     campus_id = region[:3].upper() if len(region) >= 3 else "UNK"
     return campus_id, region
 
 
-def process_metrics(current_file: str, previous_file: str, output_file: str):
+def _load_ndjson(path: str) -> List[Dict]:
+    """Read a whole NDJSON file in one go and parse each non-blank line"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return [orjson.loads(line) for line in raw.splitlines() if line.strip()]
+
+
+def process_metrics(current_file: str, previous_file: str, output_file: str,
+                    verbose: bool = False, pretty: bool = False):
     """
     Merge current and previous year metrics into Agent2Output format.
     Matches by REGION field and creates unified structure.
+    Per-region summary is only printed when verbose=True.
+    Output JSON is compact unless pretty=True (2-space indent).
     """
     
     print("📖 Reading metrics files...")
     
-    # Load current month metrics
-    current_data = []
-    with open(current_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                current_data.append(json.loads(line))
+    # Load current month and previous year metrics side by side (independent files)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fut_cur = ex.submit(_load_ndjson, current_file)
+        fut_prev = ex.submit(_load_ndjson, previous_file)
+        current_data = fut_cur.result()
+        previous_data = fut_prev.result()
     
     print(f"✅ Current month: {len(current_data)} regions")
-    
-    # Load previous year metrics
-    previous_data = []
-    with open(previous_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                previous_data.append(json.loads(line))
-    
     print(f"✅ Previous year: {len(previous_data)} regions")
     
-    # Create lookup dictionary for previous data by REGION
-    previous_lookup = {item['REGION']: item for item in previous_data}
+    # Create lookup dictionary for previous data by REGION, keeping only the metric values
+    # (tuple in METRIC_DEFAULTS order)
+    previous_lookup = {
+        item['REGION']: tuple(item.get(k, d) for k, d in METRIC_DEFAULTS.items())
+        for item in previous_data
+    }
     
     # Process and merge
     regions = []
@@ -89,32 +118,17 @@ def process_metrics(current_file: str, previous_file: str, output_file: str):
         # Extract campus info
         campus_id, campus_name = extract_campus_from_region(region_str)
         
-        # Find matching previous year data
+        # Find matching previous year metrics (already projected)
         previous = previous_lookup.get(region_str, None)
         
         # Create current month metrics
-        current_metrics = {
-            'POST_COMMENTS__SUM': current.get('POST_COMMENTS__SUM', 0),
-            'ALCANCE_TOTAL': current.get('ALCANCE_TOTAL', 0.0),
-            'VOLUMEN_DE_PUBLICACIONES': current.get('VOLUMEN_DE_PUBLICACIONES', 0),
-            'INTERACCIONES_TOTALES': current.get('INTERACCIONES_TOTALES', 0)
-        }
+        current_metrics = {k: current.get(k, d) for k, d in METRIC_DEFAULTS.items()}
         
-        # Create previous year metrics (if exists)
-        if previous:
-            previous_metrics = {
-                'POST_COMMENTS__SUM': previous.get('POST_COMMENTS__SUM', 0),
-                'ALCANCE_TOTAL': previous.get('ALCANCE_TOTAL', 0.0),
-                'VOLUMEN_DE_PUBLICACIONES': previous.get('VOLUMEN_DE_PUBLICACIONES', 0),
-                'INTERACCIONES_TOTALES': previous.get('INTERACCIONES_TOTALES', 0)
-            }
+        # Create previous year metrics (if exists), falling back to zeroed metrics
+        if previous is not None:
+            previous_metrics = dict(zip(METRIC_DEFAULTS, previous))
         else:
-            previous_metrics = {
-                'POST_COMMENTS__SUM': 0,
-                'ALCANCE_TOTAL': 0.0,
-                'VOLUMEN_DE_PUBLICACIONES': 0,
-                'INTERACCIONES_TOTALES': 0
-            }
+            previous_metrics = dict(METRIC_DEFAULTS)
             print(f"⚠️  No previous data for {campus_name} ({campus_id})")
         
         # Create combined region object
@@ -138,18 +152,20 @@ def process_metrics(current_file: str, previous_file: str, output_file: str):
     }
     
     # Save to JSON
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 if pretty else 0))
     
     print(f"\n✅ Merged metrics for {len(regions)} regions")
     print(f"💾 JSON saved to: {output_file}")
     
-    # Print summary
-    print("\n📊 Summary:")
-    for region in regions:
-        print(f"  {region['campus_id']:4s} | {region['campus_name']:20s} | "
-              f"Current: {region['current_month']['INTERACCIONES_TOTALES']:6d} | "
-              f"Previous: {region['previous_year_month']['INTERACCIONES_TOTALES']:6d}")
+    # Print summary (single write instead of one print per region)
+    if verbose:
+        lines = ["\n📊 Summary:"]
+        for region in regions:
+            lines.append(f"  {region['campus_id']:4s} | {region['campus_name']:20s} | "
+                         f"Current: {region['current_month']['INTERACCIONES_TOTALES']:6d} | "
+                         f"Previous: {region['previous_year_month']['INTERACCIONES_TOTALES']:6d}")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     return output
 
@@ -161,7 +177,8 @@ if __name__ == "__main__":
     process_metrics(
         current_file='Mes_Actual_2_SDMxRegion.json',
         previous_file='Mes_del_A_o_anterior_3_SDMxRegion.json',
-        output_file='metrics_estructurado.json'
+        output_file='metrics_estructurado.json',
+        verbose=True
     )
 
     
\ No newline at end of file
@@ -1,7 +1,21 @@
 # preprocess_publications.py
-import json
+import heapq
 import re
-from collections import defaultdict
+import orjson
+from functools import lru_cache
+
+# "Campus MTY [account]"
+_CAMPUS_RE = re.compile(r'Campus\s+(\w+)\s+\[', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def _classify_platform(social_network):
+    """Normalize platform names - ONLY Instagram and Facebook ('' = skip), cached per raw value"""
+    network = social_network.lower()
+    if 'instagram' in network:
+        return 'instagram'
+    if 'facebook' in network:
+        return 'facebook'
+    return ''
 
 def filter_publications(input_file, output_file):
     """
@@ -15,78 +29,93 @@ def filter_publications(input_file, output_file):
     """
     print(f"📖 Reading {input_file}...")
     
-    # Read all publications
-    publications_data = []
-    with open(input_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            if line.strip():
-                publications_data.append(json.loads(line))
-    
-    print(f"✅ Loaded {len(publications_data)} publications")
+    # Filter to top 4 per platform per campus
+    platform_limits = {
+        'instagram': 4,
+        'facebook': 4,
+    }
     
-    # Group by campus AND platform
-    campus_platform_posts = defaultdict(lambda: defaultdict(list))
+    # Stream publications line by line, keeping only a bounded min-heap of the
+    # top posts per flat (campus_id, platform) key - never the whole file
+    campus_platform_posts = {}
+    total_publications = 0
     
-    for pub in publications_data:
-        account = pub.get('ACCOUNT', '')
-        social_network = pub.get('SOCIAL_NETWORK', '').lower()
-        
-        # Extract campus ID
-        match = re.search(r'Campus\s+(\w+)\s+\[', account, re.IGNORECASE)
-        
-        if match:
-            campus_id = match.group(1).upper()
-            interactions = pub.get('INTERACCIONES_GENERAL__SUM', 0) or 0
-            alcance = pub.get('ALCANCE_GENERAL__SUM', 0) or 0
-            
-            # Calculate engagement score
-            engagement_score = (interactions * 10) + alcance
+    with open(input_file, 'rb') as f:
+        for seq, line in enumerate(f):
+            if not line.strip():
+                continue
+            pub = orjson.loads(line)
+            total_publications += 1
             
-            # Normalize platform names - ONLY Instagram and Facebook
-            if 'instagram' in social_network:
-                platform = 'instagram'
-            elif 'facebook' in social_network:
-                platform = 'facebook'
-            else:
-                continue  # Skip all other platforms
+            account = pub.get('ACCOUNT', '')
+            social_network = pub.get('SOCIAL_NETWORK', '')
             
-            # Keep ONLY essential fields
-            # NOTE: campus_id is NOT included here - it's at parent level
-            filtered_pub = {
-                'PUBLISHEDTIME': pub.get('PUBLISHEDTIME', ''),
-                'SOCIAL_NETWORK': pub.get('SOCIAL_NETWORK', ''),
-                'INTERACCIONES_GENERAL__SUM': interactions,
-                'ACCOUNT': pub.get('ACCOUNT', ''),
-                'ALCANCE_GENERAL__SUM': alcance,
-                'OUTBOUND_POST': pub.get('OUTBOUND_POST', ''),
-                'engagement_score': engagement_score
-            }
+            # Extract campus ID
+            match = _CAMPUS_RE.search(account)
             
-            campus_platform_posts[campus_id][platform].append(filtered_pub)
+            if match:
+                campus_id = match.group(1).upper()
+                interactions = pub.get('INTERACCIONES_GENERAL__SUM', 0) or 0
+                alcance = pub.get('ALCANCE_GENERAL__SUM', 0) or 0
+                
+                # Calculate engagement score
+                engagement_score = (interactions * 10) + alcance
+                
+                # Normalize platform names - ONLY Instagram and Facebook
+                platform = _classify_platform(social_network)
+                if not platform:
+                    continue  # Skip all other platforms
+                
+                limit = platform_limits[platform]
+                key = (campus_id, platform)
+                heap = campus_platform_posts.get(key)
+                if heap is None:
+                    heap = []
+                    campus_platform_posts[key] = heap
+                
+                # Heap is full and this post can't beat its weakest entry - skip building it
+                if len(heap) >= limit and engagement_score <= heap[0][0]:
+                    continue
+                
+                # Keep ONLY essential fields
+                # NOTE: campus_id is NOT included here - it's at parent level
+                filtered_pub = {
+                    'PUBLISHEDTIME': pub.get('PUBLISHEDTIME', ''),
+                    'SOCIAL_NETWORK': pub.get('SOCIAL_NETWORK', ''),
+                    'INTERACCIONES_GENERAL__SUM': interactions,
+                    'ACCOUNT': pub.get('ACCOUNT', ''),
+                    'ALCANCE_GENERAL__SUM': alcance,
+                    'OUTBOUND_POST': pub.get('OUTBOUND_POST', ''),
+                    'engagement_score': engagement_score
+                }
+                
+                # -seq breaks score ties in favour of the earlier post (and never compares dicts)
+                entry = (engagement_score, -seq, filtered_pub)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
     
-    # Filter to top 4 per platform per campus
-    platform_limits = {
-        'instagram': 4,
-        'facebook': 4,
-    }
+    print(f"✅ Loaded {total_publications} publications")
+    
+    # Regroup the flat buckets by campus (keeps first-seen campus/platform order)
+    campus_platforms = {}
+    for (campus_id, platform), heap in campus_platform_posts.items():
+        campus_platforms.setdefault(campus_id, []).append((platform, heap))
     
     campus_grouped_output = []
     campus_stats = {}
     
-    for campus_id, platforms in campus_platform_posts.items():
+    for campus_id, platforms in campus_platforms.items():
         campus_posts = []
         campus_breakdown = {}
         
-        for platform, posts in platforms.items():
-            limit = platform_limits.get(platform, 0)
+        for platform, heap in platforms:
+            # Heap holds the top N already - just order it by engagement score
+            top_posts = [entry[2] for entry in sorted(heap, reverse=True)]
+            campus_posts.extend(top_posts)
             
-            if limit > 0:
-                # Sort by engagement score and take top N
-                sorted_posts = sorted(posts, key=lambda x: x['engagement_score'], reverse=True)
-                top_posts = sorted_posts[:limit]
-                campus_posts.extend(top_posts)
-                
-                campus_breakdown[platform] = len(top_posts)
+            campus_breakdown[platform] = len(top_posts)
         
         # Create grouped structure for this campus
         # campus_id is here at parent level, NOT in each post
@@ -102,14 +131,14 @@ def filter_publications(input_file, output_file):
     
     # Save grouped data (one JSON object per campus)
     print(f"\n💾 Saving {len(campus_grouped_output)} campuses with their publications to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with open(output_file, 'wb') as f:
         for campus_data in campus_grouped_output:
-            f.write(json.dumps(campus_data, ensure_ascii=False) + '\n')
+            f.write(orjson.dumps(campus_data) + b'\n')
     
     # Print statistics
     total_pubs = sum(len(c['publications']) for c in campus_grouped_output)
     print(f"\n✅ Filtered file created: {output_file}")
-    print(f"📊 Reduction: {len(publications_data)} → {total_pubs} publications")
+    print(f"📊 Reduction: {total_publications} → {total_pubs} publications")
     print(f"🎯 {len(campus_stats)} campuses found")
     print(f"📦 Output format: Pre-grouped by campus (one line per campus)")
     print(f"🧹 Cleaner structure: campus_id only at parent level (not repeated in posts)\n")
@@ -1,7 +1,17 @@
 import csv
-import json
+import sys
+import orjson
+from bisect import bisect_left
 from typing import List, Dict, Any, Optional
 
+# Upper bound (inclusive) of each category; anything above the last is excepcional
+SCORE_THRESHOLDS = (75, 100, 120, 140)
+SCORE_CATEGORIES = ('deficiente', 'regular', 'satisfactorio', 'sobresaliente', 'excepcional')
+
+# Row labels (left column, lower-cased) that switch platform / carry a score
+_PLATFORMS = frozenset({'facebook', 'twitter', 'instagram', 'totales'})
+_SCORES = frozenset({'visibilidad', 'resonancia', 'permanencia', 'sentimiento', 'salud de marca'})
+
 def categorize_score(score: Optional[int]) -> Optional[str]:
     """
     Categorize score based on ranges:
@@ -14,30 +24,25 @@ def categorize_score(score: Optional[int]) -> Optional[str]:
     if score is None:
         return None
     
-    if score <= 75:
-        return "deficiente"
-    elif score <= 100:
-        return "regular"
-    elif score <= 120:
-        return "satisfactorio"
-    elif score <= 140:
-        return "sobresaliente"
-    else:  # 141+
-        return "excepcional"
+    return SCORE_CATEGORIES[bisect_left(SCORE_THRESHOLDS, score)]
 
 
-def parse_campus_scores_csv(csv_file: str, json_file: str):
+def parse_campus_scores_csv(csv_file: str, json_file: str, verbose: bool = False,
+                            pretty: bool = False):
     """
     Parse campus performance scores from 2-column CSV format.
     Converts to structured JSON matching Agent3Output schema.
     Adds score categorization for each metric.
+    Per-campus summary is only printed when verbose=True.
+    Output JSON is compact unless pretty=True (2-space indent).
     """
     
     campuses = []
     current_campus = None
     current_platform = None
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
+    # newline='' as the csv module requires, so quoted newlines and \r\n are preserved
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
         reader = csv.reader(f)
         
         for row in reader:
@@ -68,11 +73,11 @@ def parse_campus_scores_csv(csv_file: str, json_file: str):
                 current_platform = None
             
             # Detect platform
-            elif left_col in ['facebook', 'twitter', 'instagram', 'totales']:
+            elif left_col in _PLATFORMS:
                 current_platform = left_col
             
             # Detect score type
-            elif left_col in ['visibilidad', 'resonancia', 'permanencia', 'sentimiento', 'salud de marca']:
+            elif left_col in _SCORES:
                 score_type = normalize_score_name(left_col)
                 score_value = parse_score(right_col)
                 category = categorize_score(score_value)
@@ -102,22 +107,31 @@ def parse_campus_scores_csv(csv_file: str, json_file: str):
     }
     
     # Save to JSON
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    with open(json_file, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 if pretty else 0))
     
     print(f"✅ Procesados {len(campuses)} campuses con categorización")
     print(f"💾 JSON guardado en: {json_file}")
     
-    # Print summary with categories
-    print("\n📊 Summary por campus:")
-    for campus in campuses:
-        print(f"\n  {campus['campus_id']} - {campus['campus_name']}")
-        print(f"    Facebook Salud de Marca: {campus['facebook'].get('salud_de_marca')} "
-              f"({campus['facebook'].get('salud_de_marca_categoria', 'N/A')})")
-        print(f"    Instagram Salud de Marca: {campus['instagram'].get('salud_de_marca')} "
-              f"({campus['instagram'].get('salud_de_marca_categoria', 'N/A')})")
-        print(f"    Totales Salud de Marca: {campus['totales'].get('salud_de_marca')} "
-              f"({campus['totales'].get('salud_de_marca_categoria', 'N/A')})")
+    # Print summary with categories (encoded once, single write to the raw stdout buffer)
+    if verbose:
+        lines = ["\n📊 Summary por campus:"]
+        for campus in campuses:
+            lines.append(f"\n  {campus['campus_id']} - {campus['campus_name']}")
+            lines.append(f"    Facebook Salud de Marca: {campus['facebook'].get('salud_de_marca')} "
+                         f"({campus['facebook'].get('salud_de_marca_categoria', 'N/A')})")
+            lines.append(f"    Instagram Salud de Marca: {campus['instagram'].get('salud_de_marca')} "
+                         f"({campus['instagram'].get('salud_de_marca_categoria', 'N/A')})")
+            lines.append(f"    Totales Salud de Marca: {campus['totales'].get('salud_de_marca')} "
+                         f"({campus['totales'].get('salud_de_marca_categoria', 'N/A')})")
+        summary = "\n".join(lines) + "\n"
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is None:  # e.g. notebook streams have no byte buffer
+            sys.stdout.write(summary)
+        else:
+            sys.stdout.flush()  # keep earlier print() output ahead of the raw write
+            buffer.write(summary.encode(sys.stdout.encoding or 'utf-8', sys.stdout.errors or 'strict'))
+            buffer.flush()
     
     return output
 
@@ -174,14 +188,14 @@ def normalize_score_name(score_name: str) -> str:
 def parse_score(value: str) -> Optional[int]:
     """Parse score value, handle 'calificaciones' and empty values"""
     
-    if not value or value.lower() == 'calificaciones':
+    if not value:
         return None
     
-    try:
-        # Remove commas and convert to int
-        return int(value.replace(',', ''))
-    except ValueError:
-        return None
+    # Remove commas; 'calificaciones' and other text fail the digit check
+    # without going through int()'s ValueError
+    number = value.replace(',', '').strip()
+    digits = number[1:] if number[:1] in ('-', '+') else number
+    return int(number) if digits.isdecimal() else None
 
 
 # ============================================================================
@@ -190,5 +204,6 @@ def parse_score(value: str) -> Optional[int]:
 if __name__ == "__main__":
     parse_campus_scores_csv(
         csv_file='Regiones Unificadas - Valores.csv',
-        json_file='sdm_estructurado.json'
+        json_file='sdm_estructurado.json',
+        verbose=True
     )
\ No newline at end of file
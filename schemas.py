@@ -1,6 +1,5 @@
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import List, Optional, Dict, Any
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
+from typing import List, Literal, Optional, Dict, Any
 import re
 
 ######################CAMPUS NORMALIZATION UTILS##########################
@@ -28,33 +27,19 @@ CAMPUS_MAPPING = {
     'SAL': 'Árido',
 }
 
-class CampusID(str, Enum):
-    MTY = "MTY"
-    PUE = "PUE"
-    GDL = "GDL"
-    CDJ = "CDJ"
-    TOL = "TOL"
-    CCM = "CCM"
-    CEM = "CEM"
-    QRO = "QRO"
-    CHI = "CHI"
-    SIN = "SIN"
-    AGS = "AGS"
-    COB = "COB"
-    LEO = "LEO"
-    LAG = "LAG"
-    SON = "SON"
-    HGO = "HGO"
-    SLP = "SLP"
-    CVA = "CVA"
-    CSF = "CSF"
-    SAL = "SAL"
+# Literal instead of a str Enum: pydantic-core validates it as a plain set
+# membership check, with no Enum construction per value
+CampusID = Literal[
+    "MTY", "PUE", "GDL", "CDJ", "TOL", "CCM", "CEM", "QRO", "CHI", "SIN",
+    "AGS", "COB", "LEO", "LAG", "SON", "HGO", "SLP", "CVA", "CSF", "SAL",
+]
 
 # ============================================================================
 # PUBLICATIONS DATA STRUCTURE
 # ============================================================================
 
 class Publication(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
 
     platform: str = Field(
         ..., 
@@ -76,9 +61,6 @@ class Publication(BaseModel):
         ..., 
         description="Calculated engagement metric: (interacciones × 10) + alcance"
     )
-    
-    class Config:
-        extra = 'ignore'
 
 class CampusPublications(BaseModel):
     """Publications for one campus - up to 8 posts (4 Instagram + 4 Facebook)"""
@@ -106,15 +88,8 @@ class PublicationsData(BaseModel):
 # METRICS DATA STRUCTURE
 # ============================================================================
 
-class RegionMetricsCurrent(BaseModel):
-    """Current month metrics - no REGION field"""
-    POST_COMMENTS__SUM: int
-    ALCANCE_TOTAL: float
-    VOLUMEN_DE_PUBLICACIONES: int
-    INTERACCIONES_TOTALES: int
-
-class RegionMetricsPrevious(BaseModel):
-    """Previous year metrics - no REGION field"""
+class RegionMetrics(BaseModel):
+    """Metrics for one month (current or previous year) - no REGION field"""
     POST_COMMENTS__SUM: int
     ALCANCE_TOTAL: float
     VOLUMEN_DE_PUBLICACIONES: int
@@ -124,8 +99,8 @@ class RegionCombined(BaseModel):
     """Combined metrics for one campus"""
     campus_id: str
     campus_name: str
-    current_month: RegionMetricsCurrent
-    previous_year_month: RegionMetricsPrevious
+    current_month: RegionMetrics
+    previous_year_month: RegionMetrics
 
 class MetricsData(BaseModel):
     """Root structure for metrics JSON"""
@@ -184,18 +159,23 @@ class CampusValidation(BaseModel):
 class ValidationReport(BaseModel):
     """Agent 1 output - data validation report"""
     validations: List[CampusValidation]
-    total_campuses: int = 0
-    complete_campuses: int = 0
-    incomplete_campuses: int = 0
     summary: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    @model_validator(mode='after')
-    def calculate_totals(self):
-        self.total_campuses = len(self.validations)
-        self.complete_campuses = sum(1 for v in self.validations if v.is_complete)
-        self.incomplete_campuses = self.total_campuses - self.complete_campuses
-        return self
+    @computed_field
+    @property
+    def total_campuses(self) -> int:
+        return len(self.validations)
+    
+    @computed_field
+    @property
+    def complete_campuses(self) -> int:
+        return sum(1 for v in self.validations if v.is_complete)
+    
+    @computed_field
+    @property
+    def incomplete_campuses(self) -> int:
+        return self.total_campuses - self.complete_campuses
 
 # ============================================================================
 # AGENT 2: INSIGHT GENERATOR
@@ -212,13 +192,12 @@ class CampusInsight(BaseModel):
 class InsightsReport(BaseModel):
     """Agent 2 output - insights for all campuses"""
     insights: List[CampusInsight]
-    total_insights: int = 0
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    @model_validator(mode='after')
-    def set_total(self):
-        self.total_insights = len(self.insights)
-        return self
+    @computed_field
+    @property
+    def total_insights(self) -> int:
+        return len(self.insights)
 
 # ============================================================================
 # AGENT 3: FACT CHECKER
@@ -245,22 +224,32 @@ class CampusFactCheck(BaseModel):
 class FactCheckReport(BaseModel):
     """Agent 3 output - fact-checking report"""
     campus_checks: List[CampusFactCheck]
-    total_campuses_checked: int = 0
-    accurate_campuses: int = 0
-    campuses_with_errors: int = 0
-    total_issues_found: int = 0
-    overall_accuracy_rate: float = 0.0
     summary: str
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
-    @model_validator(mode='after')
-    def calculate_stats(self):
-        self.total_campuses_checked = len(self.campus_checks)
-        self.accurate_campuses = sum(1 for c in self.campus_checks if c.is_accurate)
-        self.campuses_with_errors = self.total_campuses_checked - self.accurate_campuses
-        self.total_issues_found = sum(len(c.issues_found) for c in self.campus_checks)
-        
+    @computed_field
+    @property
+    def total_campuses_checked(self) -> int:
+        return len(self.campus_checks)
+    
+    @computed_field
+    @property
+    def accurate_campuses(self) -> int:
+        return sum(1 for c in self.campus_checks if c.is_accurate)
+    
+    @computed_field
+    @property
+    def campuses_with_errors(self) -> int:
+        return self.total_campuses_checked - self.accurate_campuses
+    
+    @computed_field
+    @property
+    def total_issues_found(self) -> int:
+        return sum(len(c.issues_found) for c in self.campus_checks)
+    
+    @computed_field
+    @property
+    def overall_accuracy_rate(self) -> float:
         if self.total_campuses_checked > 0:
-            self.overall_accuracy_rate = (self.accurate_campuses / self.total_campuses_checked) * 100
-        
-        return self
\ No newline at end of file
+            return (self.accurate_campuses / self.total_campuses_checked) * 100
+        return 0.0
\ No newline at end of file